@@ -206,6 +206,30 @@ class DatabaseClient:
         print(f"Error creating download entry after {MAX_DB_RETRIES} retries: {last_error}")
         return None
 
+    def get_download_entry(self, entry_id: str) -> Optional[Dict]:
+        """Get a single download entry by ID."""
+        try:
+            response = self.client.table('download_entries').select('*').eq(
+                'id', entry_id
+            ).execute()
+            if response.data:
+                return response.data[0]
+            return None
+        except Exception as e:
+            print(f"Error getting download entry: {e}")
+            return None
+
+    def get_download_entries_by_date(self, row_date: str) -> List[Dict]:
+        """Get all download entries for a row date (YYYY-MM-DD)."""
+        try:
+            response = self.client.table('download_entries').select('*').eq(
+                'row_date', row_date
+            ).execute()
+            return response.data or []
+        except Exception as e:
+            print(f"Error getting entries for date: {e}")
+            return []
+
     def get_unprocessed_download_entries(self) -> List[Dict]:
         """Get all download entries that haven't been processed."""
         try:
@@ -304,6 +328,27 @@ class DatabaseClient:
             print(f"Error getting unprocessed PDFs: {e}")
             return []
 
+    def get_extracted_pdf_paths(self, pdf_ids: List[str]) -> Dict[str, str]:
+        """Get a {pdf_id: storage_path} map for many extracted PDFs in one query."""
+        if not pdf_ids:
+            return {}
+        conn = None
+        try:
+            conn = get_db_connection()
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT id, storage_path FROM extracted_pdfs WHERE id = ANY(%s::uuid[])",
+                    ([str(i) for i in pdf_ids],)
+                )
+                paths = {str(row['id']): row['storage_path'] for row in cursor.fetchall()}
+            conn.commit()
+            return paths
+        except Exception as e:
+            if conn is not None and not conn.closed:
+                conn.rollback()
+            print(f"Error getting extracted PDF paths: {e}")
+            return {}
+
     def update_extracted_pdf_status(self, pdf_id: str, processed: bool) -> bool:
         """Update the processed status of an extracted PDF."""
         try:
@@ -452,23 +497,38 @@ class DatabaseClient:
 
     def increment_error_retry(self, error_id: str) -> bool:
         """Increment the retry count for an error."""
-        try:
-            # Get current retry count
-            response = self.client.table('processing_errors').select(
-                'retry_count'
-            ).eq('id', error_id).execute()
+        return self.bulk_increment_error_retry([error_id]) > 0
 
-            if response.data:
-                current = response.data[0]['retry_count']
-                self.client.table('processing_errors').update({
-                    'retry_count': current + 1,
-                    'updated_at': datetime.utcnow().isoformat()
-                }).eq('id', error_id).execute()
-                return True
-            return False
+    def bulk_increment_error_retry(self, error_ids: List[str]) -> int:
+        """
+        Increment the retry count for many errors in a single UPDATE.
+
+        Args:
+            error_ids: IDs of processing_errors rows
+
+        Returns:
+            Number of rows updated
+        """
+        if not error_ids:
+            return 0
+
+        conn = None
+        try:
+            conn = get_db_connection()
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE processing_errors SET retry_count = retry_count + 1, updated_at = NOW() "
+                    "WHERE id = ANY(%s::uuid[])",
+                    ([str(i) for i in error_ids],)
+                )
+                updated = cursor.rowcount
+            conn.commit()
+            return updated
         except Exception as e:
-            print(f"Error incrementing retry count: {e}")
-            return False
+            if conn is not None and not conn.closed:
+                conn.rollback()
+            print(f"Error incrementing retry counts: {e}")
+            return 0
 
     # ==================== Download Errors ====================
 
@@ -533,6 +593,40 @@ class DatabaseClient:
             print(f"Error marking download error resolved: {e}")
             return False
 
+    def bulk_mark_resolved(self, table: str, error_ids: List[str]) -> int:
+        """
+        Mark many errors as resolved in a single UPDATE.
+
+        Args:
+            table: 'processing_errors' or 'download_errors'
+            error_ids: IDs of the errors to resolve
+
+        Returns:
+            Number of rows updated
+        """
+        if table not in ('processing_errors', 'download_errors'):
+            raise ValueError(f"Unsupported error table: {table}")
+        if not error_ids:
+            return 0
+
+        conn = None
+        try:
+            conn = get_db_connection()
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} SET resolved = TRUE, updated_at = NOW() "
+                    f"WHERE id = ANY(%s::uuid[])",
+                    ([str(i) for i in error_ids],)
+                )
+                updated = cursor.rowcount
+            conn.commit()
+            return updated
+        except Exception as e:
+            if conn is not None and not conn.closed:
+                conn.rollback()
+            print(f"Error bulk marking errors resolved: {e}")
+            return 0
+
     # ==================== Utility Methods ====================
 
     def get_all_unique_values(self, table: str, column: str) -> List[str]:
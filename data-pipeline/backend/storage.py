@@ -8,10 +8,10 @@ import time
 import tempfile
 import unicodedata
 from pathlib import Path
-from typing import Optional, List, BinaryIO
+from typing import Optional, List, BinaryIO, Iterable, Set
 from datetime import datetime
 
-from .supabase_client import get_supabase_client
+from .supabase_client import get_supabase_client, get_db_connection
 
 
 def sanitize_filename(filename: str) -> str:
@@ -331,6 +331,39 @@ class StorageClient:
         except Exception:
             return False
 
+    def existing_files(self, storage_paths: Iterable[str]) -> Optional[Set[str]]:
+        """
+        Check which of many files exist in storage with a single query.
+
+        Reads storage.objects directly instead of listing each directory.
+
+        Args:
+            storage_paths: Paths in storage bucket
+
+        Returns:
+            Set of the given paths that exist, or None if the check failed
+        """
+        paths = list(set(storage_paths))
+        if not paths:
+            return set()
+
+        conn = None
+        try:
+            conn = get_db_connection()
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT name FROM storage.objects WHERE bucket_id = %s AND name = ANY(%s)",
+                    (self.bucket_name, paths)
+                )
+                existing = {row['name'] for row in cursor.fetchall()}
+            conn.commit()
+            return existing
+        except Exception as e:
+            if conn is not None and not conn.closed:
+                conn.rollback()
+            print(f"Error checking storage objects: {e}")
+            return None
+
     def list_files(self, prefix: str = "", limit: int = 100) -> List[dict]:
         """
         List files in storage with optional prefix filter.
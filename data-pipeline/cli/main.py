@@ -258,7 +258,10 @@ def cmd_retry_errors(args):
     from processing.processor import DataProcessor
 
     processor = DataProcessor(max_threads=args.threads)
-    result = processor.retry_errors(error_type=args.error_type)
+    result = processor.retry_errors(
+        error_type=args.error_type,
+        parallel=not args.sequential
+    )
 
     print(f"Resolved: {result['resolved']} / {result['total']}")
     return 0
@@ -1340,6 +1343,7 @@ Examples:
         help='Retry failed processing'
     )
     p_retry.add_argument('--error-type', type=str)
+    p_retry.add_argument('--sequential', action='store_true')
     p_retry.add_argument('--threads', type=int, default=8)
 
     # ============== download-errors ==============
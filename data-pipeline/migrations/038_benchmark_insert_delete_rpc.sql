@@ -0,0 +1,21 @@
+-- Migration: RPC function for the REST INSERT benchmark
+-- Inserts a throwaway processing_errors row and deletes it again inside one
+-- server-side transaction, so scripts/benchmark_qps.py measures one REST
+-- round-trip per write instead of an INSERT request plus a cleanup DELETE.
+-- Date: 2026-10-15
+
+CREATE OR REPLACE FUNCTION benchmark_insert_delete(p_id UUID)
+RETURNS UUID
+LANGUAGE plpgsql VOLATILE
+AS $$
+BEGIN
+    INSERT INTO processing_errors (id, error_type, error_message, source_path, source_type)
+    VALUES (p_id, 'benchmark_test', 'Benchmark test', 'benchmark/test', 'benchmark');
+
+    DELETE FROM processing_errors WHERE id = p_id;
+
+    RETURN p_id;
+END;
+$$;
+
+COMMENT ON FUNCTION benchmark_insert_delete IS 'Benchmark helper: insert + delete a processing_errors row in one call';
@@ -0,0 +1,12 @@
+-- Migration: Index the columns probed by the error report's NOT EXISTS anti-joins
+-- scripts/generate_report.py checks unresolved processing_errors against
+-- processed_prices.source_path and download_errors against
+-- download_entries.download_link (already indexed by idx_download_entries_link).
+-- Without an index on source_path the planner falls back to a hash anti-join
+-- over all of processed_prices.
+--
+-- Not CONCURRENTLY: run_migrations.py applies each file inside a transaction.
+-- On a busy database, run the statement by hand with CONCURRENTLY instead.
+-- Date: 2026-10-15
+
+CREATE INDEX IF NOT EXISTS idx_processed_prices_source_path ON processed_prices(source_path);
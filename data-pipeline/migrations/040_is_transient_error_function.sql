@@ -0,0 +1,38 @@
+-- Migration: SQL classifier for transient errors, plus partial indexes on it
+-- scripts/generate_report.py excludes transient errors (network blips, rate
+-- limits, already-processed files). Classifying them in one IMMUTABLE function
+-- lets the report filter with NOT is_transient(...) and lets the planner use
+-- partial indexes that only contain actionable, unresolved errors.
+--
+-- Keep the lists in sync with TRANSIENT_ERROR_TYPES / TRANSIENT_ERROR_MESSAGES
+-- in scripts/generate_report.py.
+--
+-- Not CONCURRENTLY: run_migrations.py applies each file inside a transaction.
+-- Date: 2026-10-15
+
+CREATE OR REPLACE FUNCTION is_transient(p_error_type TEXT, p_error_message TEXT)
+RETURNS BOOLEAN
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT COALESCE(p_error_type, '') = ANY (ARRAY[
+               'upload_transient',
+               'upload_duplicate',
+               'database_error',
+               'processing_failed'
+           ])
+        OR COALESCE(p_error_message, '') ~* (
+               'errno 35|resource temporarily unavailable|rate limit|too many requests'
+               '|connection reset|connection refused|timeout|network connection lost'
+               '|gateway error|already processed|already exists|duplicate'
+           );
+$$;
+
+COMMENT ON FUNCTION is_transient IS 'True for transient/retryable errors excluded from the error report';
+
+CREATE INDEX IF NOT EXISTS idx_download_errors_actionable
+    ON download_errors(error_type, created_at)
+    WHERE resolved = FALSE AND NOT is_transient(error_type, error_message);
+
+CREATE INDEX IF NOT EXISTS idx_processing_errors_actionable
+    ON processing_errors(error_type, created_at)
+    WHERE resolved = FALSE AND NOT is_transient(error_type, error_message);
@@ -33,6 +33,10 @@ from processing.zip_handler import ZIPHandler, ExtractionResult
 from processing.ocr_fallback import is_scanned_pdf, needs_ocr_fallback, ocr_extract_prices
 
 
+# Resolved error IDs are flushed to the database in batches of this size
+RESOLVE_FLUSH_SIZE = 100
+
+
 @dataclass
 class ProcessingResult:
     """Result of processing a download entry."""
@@ -155,19 +159,11 @@ class DataProcessor:
         Returns:
             ProcessingResult
         """
-        # Get entry from database
-        entries = self.database.get_unprocessed_download_entries()
-        entry = next((e for e in entries if e['id'] == entry_id), None)
+        # Get entry from database (processed or not)
+        entry = self.database.get_download_entry(entry_id)
 
         if not entry:
-            # Try to get it even if processed
-            from backend.supabase_client import get_supabase_client
-            client = get_supabase_client()
-            response = client.table('download_entries').select('*').eq('id', entry_id).execute()
-            if response.data:
-                entry = response.data[0]
-            else:
-                raise ValueError(f"Download entry not found: {entry_id}")
+            raise ValueError(f"Download entry not found: {entry_id}")
 
         return self._process_entry(entry)
 
@@ -181,14 +177,7 @@ class DataProcessor:
         Returns:
             Summary dict
         """
-        from backend.supabase_client import get_supabase_client
-        client = get_supabase_client()
-
-        response = client.table('download_entries').select('*').eq(
-            'row_date', target_date
-        ).execute()
-
-        entries = response.data or []
+        entries = self.database.get_download_entries_by_date(target_date)
 
         if not entries:
             print(f"No entries found for date: {target_date}")
@@ -512,12 +501,13 @@ class DataProcessor:
             if os.path.exists(temp_excel):
                 os.remove(temp_excel)
 
-    def retry_errors(self, error_type: Optional[str] = None) -> Dict:
+    def retry_errors(self, error_type: Optional[str] = None, parallel: bool = True) -> Dict:
         """
         Retry processing for files with errors.
 
         Args:
             error_type: Optional filter by error type
+            parallel: Use multithreading
 
         Returns:
             Summary dict
@@ -532,48 +522,71 @@ class DataProcessor:
         if not errors:
             return {'total': 0, 'resolved': 0}
 
-        resolved = 0
+        # Prefetch storage paths for PDF-level errors instead of one lookup per error
+        pdf_paths = self.database.get_extracted_pdf_paths(
+            [e['extracted_pdf_id'] for e in errors if e.get('extracted_pdf_id')]
+        )
 
+        # Drop PDFs whose files are gone from storage, checked in one query
+        # rather than discovered one failed download at a time
+        existing = self.storage.existing_files(pdf_paths.values())
+        if existing is not None:
+            found = {pdf_id: path for pdf_id, path in pdf_paths.items() if path in existing}
+            if len(found) < len(pdf_paths):
+                print(f"Skipping {len(pdf_paths) - len(found)} PDFs missing from storage")
+            pdf_paths = found
+
+        # Count this attempt for every retryable error up front, in one statement
+        self.database.bulk_increment_error_retry(
+            [e['id'] for e in errors if e.get('download_entry_id')]
+        )
+
+        # A failed entry accumulates an error row per run, so retry each target once:
+        # one task per entry with an entry-level error (it reprocesses every PDF in
+        # it), otherwise one per (entry, PDF). Concurrent retries of the same entry
+        # would both see its PDFs as unprocessed and insert the prices twice.
+        retry_entries = {
+            e['download_entry_id'] for e in errors
+            if e.get('download_entry_id') and not e.get('extracted_pdf_id')
+        }
+        groups: Dict[tuple, List[dict]] = {}
         for error in errors:
             entry_id = error.get('download_entry_id')
-            pdf_id = error.get('extracted_pdf_id')
-
             if not entry_id:
                 continue
+            pdf_id = None if entry_id in retry_entries else error.get('extracted_pdf_id')
+            groups.setdefault((entry_id, pdf_id), []).append(error)
 
-            # Increment retry count
-            self.database.increment_error_retry(error['id'])
-
-            # Try processing again
-            try:
-                if pdf_id:
-                    # Retry specific PDF
-                    # Get PDF entry
-                    from backend.supabase_client import get_supabase_client
-                    client = get_supabase_client()
-                    response = client.table('extracted_pdfs').select('*').eq(
-                        'id', pdf_id
-                    ).execute()
-
-                    if response.data:
-                        pdf_entry = response.data[0]
-                        prices, new_errors = self._process_pdf(
-                            pdf_entry['storage_path'],
-                            download_entry_id=entry_id,
-                            extracted_pdf_id=pdf_id
-                        )
-                        if prices > 0:
-                            self.database.mark_error_resolved(error['id'])
-                            resolved += 1
-                else:
-                    # Retry full entry
-                    result = self.process_entry(entry_id)
-                    if result.success:
-                        self.database.mark_error_resolved(error['id'])
-                        resolved += 1
+        resolved = 0
+        resolved_ids = []
+
+        def record(group: List[dict], success: bool):
+            nonlocal resolved, resolved_ids
+            if not success:
+                return
+            resolved_ids.extend(e['id'] for e in group)
+            resolved += len(group)
+            # Flush periodically so progress survives an interrupted run
+            if len(resolved_ids) >= RESOLVE_FLUSH_SIZE:
+                self.database.bulk_mark_resolved('processing_errors', resolved_ids)
+                resolved_ids = []
 
-            except Exception as e:
-                print(f"  [ERROR] Retry failed: {e}")
+        try:
+            if parallel and len(groups) > 1:
+                print(f"Retrying {len(groups)} targets in parallel ({self.max_threads} threads)...")
+                with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
+                    futures = {
+                        executor.submit(self._retry_error, entry_id, pdf_id, pdf_paths): group
+                        for (entry_id, pdf_id), group in groups.items()
+                    }
+
+                    for future in as_completed(futures):
+                        record(futures[future], future.result())
+            else:
+                for (entry_id, pdf_id), group in groups.items():
+                    record(group, self._retry_error(entry_id, pdf_id, pdf_paths))
+        finally:
+            self.database.bulk_mark_resolved('processing_errors', resolved_ids)
 
         print(f"\nResolved: {resolved} / {len(errors)}")
 
@@ -582,6 +595,41 @@ class DataProcessor:
             'resolved': resolved
         }
 
+    def _retry_error(self, entry_id: str, pdf_id: Optional[str], pdf_paths: Dict[str, str]) -> bool:
+        """
+        Retry processing for one download entry, or one PDF within it.
+
+        Args:
+            entry_id: download_entries ID
+            pdf_id: extracted_pdfs ID, or None to reprocess the whole entry
+            pdf_paths: Prefetched {extracted_pdf_id: storage_path} map
+
+        Returns:
+            True if the retry succeeded
+        """
+        # Try processing again
+        try:
+            if pdf_id:
+                # Retry specific PDF
+                storage_path = pdf_paths.get(str(pdf_id))
+                if not storage_path:
+                    return False
+
+                prices, new_errors = self._process_pdf(
+                    storage_path,
+                    download_entry_id=entry_id,
+                    extracted_pdf_id=pdf_id
+                )
+                return prices > 0
+
+            # Retry full entry
+            result = self.process_entry(entry_id)
+            return result.success
+
+        except Exception as e:
+            print(f"  [ERROR] Retry failed: {e}")
+            return False
+
 
 def main():
     """CLI entry point for data processor."""
@@ -612,7 +660,7 @@ def main():
         result = processor.process_by_date(args.date)
         print(f"Result: {result}")
     elif args.retry_errors:
-        result = processor.retry_errors(args.error_type)
+        result = processor.retry_errors(args.error_type, parallel=not args.sequential)
         print(f"Result: {result}")
     else:
         result = processor.process_all_pending(parallel=not args.sequential)
@@ -11,7 +11,7 @@ import sys
 import time
 from datetime import date
 from pathlib import Path
-from typing import List, Optional
+from typing import List
 
 import requests
 
@@ -19,8 +19,9 @@ _parent_dir = str(Path(__file__).parent.parent)
 if _parent_dir not in sys.path:
     sys.path.insert(0, _parent_dir)
 
-from config import REQUEST_DELAY, REQUEST_TIMEOUT, MAX_RETRIES, DATA_PIPELINE_ROOT
+from config import REQUEST_DELAY, REQUEST_TIMEOUT, DATA_PIPELINE_ROOT
 from backend.database import DatabaseClient, DownloadEntry
+from scraping.downloads import download_to_file
 from scraping.freshness import check_url_freshness, cleanup_stale_entry
 
 # Local directory for large abastecimiento files (not uploaded to Supabase storage)
@@ -57,19 +58,6 @@ class AbastecimientoScraper:
         self.database = DatabaseClient()
         ABAST_LOCAL_DIR.mkdir(parents=True, exist_ok=True)
 
-    def _request_with_retry(self, url: str, **kwargs) -> Optional[requests.Response]:
-        kwargs.setdefault('timeout', REQUEST_TIMEOUT * 3)  # Larger files need more time
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = self.session.get(url, **kwargs)
-                response.raise_for_status()
-                return response
-            except requests.RequestException as e:
-                print(f"  Request failed (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(REQUEST_DELAY * (attempt + 1) * 2)
-        return None
-
     def scrape_historical(self) -> dict:
         """Download all historical abastecimiento files."""
         print("=" * 60)
@@ -116,15 +104,13 @@ class AbastecimientoScraper:
                 print(f"  [LOCAL] Already on disk: {filename} ({size_mb:.1f} MB)")
             else:
                 print(f"  Downloading: {filename} ...", end='', flush=True)
-                response = self._request_with_retry(url)
-                if not response:
+                size_bytes = download_to_file(self.session, url, local_path, timeout=REQUEST_TIMEOUT * 3)
+                if size_bytes is None:
                     print(f" FAILED")
                     failed += 1
                     continue
 
-                with open(local_path, 'wb') as f:
-                    f.write(response.content)
-                size_mb = len(response.content) / 1024 / 1024
+                size_mb = size_bytes / 1024 / 1024
                 print(f" {size_mb:.1f} MB")
 
             # Parse year from filename
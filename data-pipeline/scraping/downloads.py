@@ -0,0 +1,57 @@
+"""
+Streaming downloads for the large SIPSA workbooks saved to local disk.
+
+The abastecimiento and insumos series are 50-100 MB each. `download_to_file`
+streams them to a `.part` file in 1 MB chunks and renames it into place once
+complete, so an interrupted download is never mistaken for a finished one.
+With `stream=True` the body is read after the request returns, so the retry
+loop wraps the whole transfer rather than just the request.
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+from config import REQUEST_DELAY, MAX_RETRIES
+
+CHUNK_SIZE = 1 << 20
+
+
+def download_to_file(session: requests.Session, url: str, local_path: Path,
+                     timeout: int) -> Optional[int]:
+    """Download `url` to `local_path`, retrying dropped transfers from scratch.
+
+    Returns:
+        Bytes written, or None if every attempt failed
+    """
+    part_path = local_path.with_name(local_path.name + '.part')
+
+    for attempt in range(MAX_RETRIES):
+        total = 0
+        try:
+            with session.get(url, stream=True, timeout=timeout) as response:
+                response.raise_for_status()
+                with open(part_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        f.write(chunk)
+                        total += len(chunk)
+        except requests.RequestException as e:
+            # Covers failures mid-body too (dropped connection, read timeout)
+            part_path.unlink(missing_ok=True)
+            print(f"  Download failed (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
+            if attempt < MAX_RETRIES - 1:
+                time.sleep(REQUEST_DELAY * (attempt + 1) * 2)
+            continue
+        except OSError as e:
+            # Local disk errors won't go away on retry
+            part_path.unlink(missing_ok=True)
+            print(f"  Could not write {local_path.name}: {e}")
+            return None
+
+        part_path.replace(local_path)
+        return total
+
+    return None
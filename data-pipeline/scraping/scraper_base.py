@@ -33,6 +33,16 @@ from backend.storage import StorageClient
 from backend.database import DatabaseClient, DownloadEntry, DownloadError
 
 
+# Date patterns tried by ScraperBase.extract_date_from_url (matched against the lowercased URL)
+_MODERN_DATE_RE = re.compile(r'(\d{1,2})([a-z]{3,4})(\d{4})')  # 24dic2025
+_MAYORISTAS_MONTH_RE = re.compile(r'mayoristas_([a-z]+)_(\d{1,2})_(\d{4})')  # mayoristas_noviembre_30_2018
+_ABBR_MONTH_RE = re.compile(r'(?:anex|bol)_([a-z]{3,4})_(\d{1,2})_(\d{4})')  # anex_feb_28_2022
+_ANEXO_ABBR_MONTH_RE = re.compile(r'mayoristas_anexo_([a-z]{3,4})_(\d{1,2})_(\d{4})')  # mayoristas_anexo_sept_28_2012
+_ANEXO_MONTH_RE = re.compile(r'mayoristas_anexo_([a-z]+)_(\d{1,2})_(\d{4})')  # mayoristas_anexo_agosto_31_2012
+_MAYORISTAS_XLS_RE = re.compile(r'mayoristas_([a-z]+)_(\d{1,2})_(\d{4})\.xls')  # mayoristas_julio_31_2012.xls
+_BOL_REG_DATE_RE = re.compile(r'bol-reg-(\d{1,2})-(\d{2})-(\d{4})')  # bol-reg-28-02-2022
+_SIPSA_DATE_RE = re.compile(r'sipsa-(\d{1,2})-(\d{2})-(\d{4})')  # sipsa-08-01-2021
+
 @dataclass
 class FileLink:
     """Represents a file link found on the SIPSA website."""
@@ -114,7 +124,7 @@ class ScraperBase:
         url_lower = url.lower()
 
         # Modern format: 24dic2025 (day + 3-letter-month + year concatenated)
-        pattern1 = re.search(r'(\d{1,2})([a-z]{3,4})(\d{4})', url_lower)
+        pattern1 = _MODERN_DATE_RE.search(url_lower)
         if pattern1:
             day, month_abbr, year = pattern1.groups()
             month = MONTH_ABBR_MAP.get(month_abbr)
@@ -125,7 +135,7 @@ class ScraperBase:
                     pass
 
         # Historical format with full month: mayoristas_noviembre_30_2018
-        pattern2 = re.search(r'mayoristas_([a-z]+)_(\d{1,2})_(\d{4})', url_lower)
+        pattern2 = _MAYORISTAS_MONTH_RE.search(url_lower)
         if pattern2:
             month_name, day, year = pattern2.groups()
             month = MONTHS_ES_REVERSE.get(month_name)
@@ -136,7 +146,7 @@ class ScraperBase:
                     pass
 
         # Historical format with abbreviated month: anex_feb_28_2022, bol_feb_28_2022
-        pattern3 = re.search(r'(?:anex|bol)_([a-z]{3,4})_(\d{1,2})_(\d{4})', url_lower)
+        pattern3 = _ABBR_MONTH_RE.search(url_lower)
         if pattern3:
             month_abbr, day, year = pattern3.groups()
             month = MONTH_ABBR_MAP.get(month_abbr)
@@ -147,7 +157,7 @@ class ScraperBase:
                     pass
 
         # Old anexo format with abbreviated month: mayoristas_anexo_sept_28_2012.xls
-        pattern5 = re.search(r'mayoristas_anexo_([a-z]{3,4})_(\d{1,2})_(\d{4})', url_lower)
+        pattern5 = _ANEXO_ABBR_MONTH_RE.search(url_lower)
         if pattern5:
             month_abbr, day, year = pattern5.groups()
             month = MONTH_ABBR_MAP.get(month_abbr)
@@ -158,7 +168,7 @@ class ScraperBase:
                     pass
 
         # Old anexo format with full month name: mayoristas_anexo_agosto_31_2012.xls
-        pattern6 = re.search(r'mayoristas_anexo_([a-z]+)_(\d{1,2})_(\d{4})', url_lower)
+        pattern6 = _ANEXO_MONTH_RE.search(url_lower)
         if pattern6:
             month_name, day, year = pattern6.groups()
             month = MONTHS_ES_REVERSE.get(month_name)
@@ -169,7 +179,7 @@ class ScraperBase:
                     pass
 
         # Old format: mayoristas_julio_31_2012.xls (for Jun-Jul 2012)
-        pattern7 = re.search(r'mayoristas_([a-z]+)_(\d{1,2})_(\d{4})\.xls', url_lower)
+        pattern7 = _MAYORISTAS_XLS_RE.search(url_lower)
         if pattern7:
             month_name, day, year = pattern7.groups()
             month = MONTHS_ES_REVERSE.get(month_name)
@@ -180,7 +190,7 @@ class ScraperBase:
                     pass
 
         # Regional format: bol-reg-28-02-2022.zip (dd-mm-yyyy with hyphens)
-        pattern4 = re.search(r'bol-reg-(\d{1,2})-(\d{2})-(\d{4})', url_lower)
+        pattern4 = _BOL_REG_DATE_RE.search(url_lower)
         if pattern4:
             day, month, year = pattern4.groups()
             try:
@@ -189,7 +199,7 @@ class ScraperBase:
                 pass
 
         # SIPSA regional reports: sipsa-08-01-2021.zip (dd-mm-yyyy with hyphens)
-        pattern_sipsa = re.search(r'sipsa-(\d{1,2})-(\d{2})-(\d{4})', url_lower)
+        pattern_sipsa = _SIPSA_DATE_RE.search(url_lower)
         if pattern_sipsa:
             day, month, year = pattern_sipsa.groups()
             try:
@@ -12,26 +12,120 @@ Tests various database operations to identify performance bottlenecks:
 Usage:
     python scripts/benchmark_qps.py
     python scripts/benchmark_qps.py --output exports/benchmark_results.md
+    python scripts/benchmark_qps.py --parallel   # Independent tests in worker processes
 """
 
 import argparse
+import asyncio
+import io
 import os
 import sys
+import math
+import multiprocessing
 import time
 import statistics
 from pathlib import Path
+from urllib.parse import urlsplit
 from datetime import datetime, date
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
 import uuid
 
+import asyncpg
+import httpx
+import numpy as np
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from backend.supabase_client import get_supabase_client, get_db_connection, close_connections
+from backend.supabase_client import close_connections
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_batch
+from psycopg2.pool import ThreadedConnectionPool
+from supabase import Client, ClientOptions, create_client
+
+
+# Log-bucketed latency histogram: bucket = log1p(latency_us) * HIST_SCALE.
+# Latencies are integer nanoseconds (time.perf_counter_ns) until reporting.
+# 1024 buckets at this scale cover up to ~90s with ~2% relative resolution.
+HIST_BUCKETS = 1024
+HIST_SCALE = 56
+
+# Batches larger than this are binned with numba when it is installed; below
+# it the JIT call overhead isn't worth it and numpy's bincount is used
+NUMBA_MIN_BATCH = 10_000
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+
+def _bin_latencies_numpy(latencies_ns: np.ndarray, hist: np.ndarray, scale: float):
+    """Add a batch of ns latencies to a log-bucketed histogram (vectorized)."""
+    slots = (np.log1p(latencies_ns / 1000) * scale).astype(np.int64)
+    np.minimum(slots, len(hist) - 1, out=slots)
+    hist += np.bincount(slots, minlength=len(hist)).astype(hist.dtype)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _bin_latencies_jit(latencies_ns, hist, scale):
+        """Add a batch of ns latencies to a log-bucketed histogram (single fused loop)."""
+        top = hist.shape[0] - 1
+        for latency in latencies_ns:
+            hist[min(int(math.log1p(latency / 1000.0) * scale), top)] += 1
+else:
+    _bin_latencies_jit = None
+
+
+def bin_latencies(latencies_ns: np.ndarray, hist: np.ndarray, scale: float):
+    """Add a batch of ns latencies to a histogram, using numba for large batches."""
+    if _bin_latencies_jit is not None and len(latencies_ns) > NUMBA_MIN_BATCH:
+        _bin_latencies_jit(latencies_ns, hist, scale)
+    else:
+        _bin_latencies_numpy(latencies_ns, hist, scale)
+
+
+class LatencyHistogram:
+    """Fixed-size latency histogram with running min/max/sum (memory is O(1) in op count)."""
+
+    def __init__(self):
+        self.hist = np.zeros(HIST_BUCKETS, dtype=np.uint32)
+        self.count = 0
+        self.total = 0
+        self.min = math.inf
+        self.max = 0
+
+    def record(self, latency: int):
+        """Record a latency in nanoseconds."""
+        self.hist[min(int(math.log1p(latency / 1000) * HIST_SCALE), HIST_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += latency
+        if latency < self.min:
+            self.min = latency
+        if latency > self.max:
+            self.max = latency
+
+    def record_many(self, latencies: np.ndarray):
+        """Record a batch of latencies in nanoseconds."""
+        if not len(latencies):
+            return
+        bin_latencies(latencies, self.hist, HIST_SCALE)
+        self.count += len(latencies)
+        self.total += int(latencies.sum())
+        self.min = min(self.min, int(latencies.min()))
+        self.max = max(self.max, int(latencies.max()))
+
+    def percentile(self, p: float) -> float:
+        """Approximate percentile in nanoseconds (upper edge of the matching bucket)."""
+        if not self.count:
+            return 0
+        cum = np.cumsum(self.hist)
+        slot = int(np.searchsorted(cum, p / 100 * cum[-1]))
+        # Invert the bucket function, clamped to the observed range
+        return min(max(math.expm1((slot + 1) / HIST_SCALE) * 1000, self.min), self.max)
 
 
 @dataclass
@@ -44,23 +138,70 @@ class BenchmarkResult:
     total_time_sec: float
     qps: float
     avg_latency_ms: float
-    p50_latency_ms: float
-    p95_latency_ms: float
-    p99_latency_ms: float
     min_latency_ms: float
     max_latency_ms: float
     errors: List[str]
+    latencies: Optional[LatencyHistogram] = field(default=None, repr=False, compare=False)
+    rows_per_op: int = 1  # Rows written per operation (batched writes/COPY)
+    # Report categories, derived once from the name
+    is_rest_read: bool = field(init=False)
+    is_pg_read: bool = field(init=False)
+    is_write: bool = field(init=False)
+    is_conn_test: bool = field(init=False)
+    _percentile_cache: Dict[float, float] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.is_write = "INSERT" in self.name or "COPY" in self.name
+        self.is_rest_read = "REST API SELECT" in self.name and not self.is_write
+        self.is_pg_read = "PostgreSQL SELECT" in self.name
+        self.is_conn_test = "Concurrent Connections" in self.name
+
+    def percentile(self, p: float) -> float:
+        """Latency percentile in ms, computed from the histogram once per p."""
+        if p not in self._percentile_cache:
+            self._percentile_cache[p] = self.latencies.percentile(p) * 1e-6 if self.latencies else 0
+        return self._percentile_cache[p]
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.qps * self.rows_per_op
+
+    @property
+    def p50_latency_ms(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p95_latency_ms(self) -> float:
+        return self.percentile(95)
+
+    @property
+    def p99_latency_ms(self) -> float:
+        return self.percentile(99)
+
+
+MAX_KEPT_ERRORS = 10
+
+
+class ErrorSample:
+    """Failure counter that keeps only the first MAX_KEPT_ERRORS messages."""
 
+    def __init__(self):
+        self.count = 0
+        self.messages: List[str] = []
 
-def percentile(data: List[float], p: float) -> float:
-    """Calculate percentile of a sorted list."""
-    if not data:
-        return 0
-    sorted_data = sorted(data)
-    k = (len(sorted_data) - 1) * p / 100
-    f = int(k)
-    c = f + 1 if f + 1 < len(sorted_data) else f
-    return sorted_data[f] + (k - f) * (sorted_data[c] - sorted_data[f]) if c != f else sorted_data[f]
+    def record(self, message: str):
+        self.count += 1
+        if len(self.messages) < MAX_KEPT_ERRORS:
+            self.messages.append(message)
+
+
+def record_outcomes(outcomes, latencies: LatencyHistogram, errors: ErrorSample):
+    """Record (latency, error) pairs from a benchmark run."""
+    for latency, error in outcomes:
+        if error is None:
+            latencies.record(latency)
+        else:
+            errors.record(error)
 
 
 def run_benchmark(
@@ -69,70 +210,133 @@ def run_benchmark(
     num_operations: int,
     concurrency: int = 1,
     setup_func=None,
-    teardown_func=None
+    teardown_func=None,
+    rows_per_op: int = 1
 ) -> BenchmarkResult:
     """
     Run a benchmark with the given operation function.
 
     Args:
         name: Name of the benchmark
-        operation_func: Function to execute (should return latency in seconds or None on failure)
+        operation_func: Function to execute (should return latency in ns or None on failure)
         num_operations: Number of operations to run
         concurrency: Number of concurrent workers
         setup_func: Optional setup function
         teardown_func: Optional teardown function
+        rows_per_op: Rows written by each operation, for rows/s reporting
     """
     if setup_func:
         setup_func()
 
-    latencies = []
-    errors = []
+    latencies = LatencyHistogram()
+    errors = ErrorSample()
 
     start_time = time.perf_counter()
 
+    def guarded(i):
+        # Return (latency, error) so one failure doesn't abort executor.map
+        try:
+            latency = operation_func(i)
+            if latency is None:
+                return None, f"Operation {i} returned None"
+            return latency, None
+        except Exception as e:
+            return None, str(e)[:100]
+
     if concurrency == 1:
         # Sequential execution
-        for i in range(num_operations):
-            try:
-                latency = operation_func(i)
-                if latency is not None:
-                    latencies.append(latency)
-                else:
-                    errors.append(f"Operation {i} returned None")
-            except Exception as e:
-                errors.append(str(e)[:100])
+        record_outcomes(map(guarded, range(num_operations)), latencies, errors)
     else:
-        # Concurrent execution
+        # Concurrent execution; results are recorded in submission order
         with ThreadPoolExecutor(max_workers=concurrency) as executor:
-            futures = {executor.submit(operation_func, i): i for i in range(num_operations)}
-            for future in as_completed(futures):
-                try:
-                    latency = future.result(timeout=30)
-                    if latency is not None:
-                        latencies.append(latency)
-                    else:
-                        errors.append(f"Operation returned None")
-                except Exception as e:
-                    errors.append(str(e)[:100])
+            record_outcomes(executor.map(guarded, range(num_operations)), latencies, errors)
 
     total_time = time.perf_counter() - start_time
 
     if teardown_func:
         teardown_func()
 
-    successful = len(latencies)
-    failed = len(errors)
-
-    # Calculate statistics
-    if latencies:
-        avg_latency = statistics.mean(latencies) * 1000
-        p50 = percentile(latencies, 50) * 1000
-        p95 = percentile(latencies, 95) * 1000
-        p99 = percentile(latencies, 99) * 1000
-        min_lat = min(latencies) * 1000
-        max_lat = max(latencies) * 1000
+    return build_result(name, num_operations, latencies, errors, total_time, rows_per_op)
+
+
+async def _run_async_benchmark(operation_coro, pool, num_operations: int, concurrency: int,
+                               latencies: LatencyHistogram, errors: ErrorSample):
+    """Run operations on one event loop, bounded to `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(i):
+        async with semaphore:
+            return await operation_coro(pool, i)
+
+    outcomes = await asyncio.gather(*(bounded(i) for i in range(num_operations)), return_exceptions=True)
+    successes = np.empty(len(outcomes), dtype=np.int64)
+    filled = 0
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            errors.record(str(outcome)[:100])
+        elif outcome is not None:
+            successes[filled] = outcome
+            filled += 1
+        else:
+            errors.record("Operation returned None")
+    # All results are in hand, so bin them in one batch
+    latencies.record_many(successes[:filled])
+
+
+def run_async_benchmark(
+    name: str,
+    operation_coro,
+    num_operations: int,
+    concurrency: int
+) -> BenchmarkResult:
+    """
+    Run a benchmark of an async operation against an asyncpg pool.
+
+    Args:
+        name: Name of the benchmark
+        operation_coro: Coroutine function (pool, i) returning latency in ns or None on failure
+        num_operations: Number of operations to run
+        concurrency: Maximum operations in flight (also the pool size)
+    """
+    latencies = LatencyHistogram()
+    errors = ErrorSample()
+
+    async def main():
+        db_url = os.getenv("SUPABASE_DB_URL")
+        # Keep asyncpg's prepared-statement cache on direct connections; the
+        # pooler needs it disabled
+        pool_kwargs = {'statement_cache_size': 0} if is_pooler_url(db_url) else {}
+        async with asyncpg.create_pool(db_url, min_size=concurrency, max_size=concurrency,
+                                       **pool_kwargs) as pool:
+            start = time.perf_counter()
+            await _run_async_benchmark(operation_coro, pool, num_operations, concurrency,
+                                       latencies, errors)
+            return time.perf_counter() - start
+
+    total_time = asyncio.run(main())
+
+    return build_result(name, num_operations, latencies, errors, total_time)
+
+
+def build_result(
+    name: str,
+    num_operations: int,
+    latencies: LatencyHistogram,
+    errors: ErrorSample,
+    total_time: float,
+    rows_per_op: int = 1
+) -> BenchmarkResult:
+    """Summarize recorded latencies and errors into a BenchmarkResult."""
+    successful = latencies.count
+    failed = errors.count
+
+    # Calculate statistics (ns -> ms only here)
+    if successful:
+        avg_latency = latencies.total / successful * 1e-6
+        min_lat = latencies.min * 1e-6
+        max_lat = latencies.max * 1e-6
     else:
-        avg_latency = p50 = p95 = p99 = min_lat = max_lat = 0
+        avg_latency = min_lat = max_lat = 0
 
     qps = successful / total_time if total_time > 0 else 0
 
@@ -144,47 +348,122 @@ def run_benchmark(
         total_time_sec=total_time,
         qps=qps,
         avg_latency_ms=avg_latency,
-        p50_latency_ms=p50,
-        p95_latency_ms=p95,
-        p99_latency_ms=p99,
         min_latency_ms=min_lat,
         max_latency_ms=max_lat,
-        errors=errors[:10]  # Keep only first 10 errors
+        errors=errors.messages,
+        latencies=latencies,
+        rows_per_op=rows_per_op
     )
 
 
 # ============== Benchmark Operations ==============
 
+def is_pooler_url(db_url: str) -> bool:
+    """
+    True if the URL goes through the Supabase pooler rather than a direct connection.
+
+    A pooler may hand each transaction to a different backend, so session-level
+    prepared statements (SQL PREPARE, asyncpg's statement cache) are unsafe there.
+    """
+    return (urlsplit(db_url).hostname or '').endswith('.pooler.supabase.com')
+
+
+# Shared connection pool so concurrent tests measure query QPS, not handshakes
+POOL_MIN_CONN = 1
+POOL_MAX_CONN = 50
+_pool: Optional[ThreadedConnectionPool] = None
+
+
+def get_pool() -> ThreadedConnectionPool:
+    """Get or create the shared PostgreSQL connection pool."""
+    global _pool
+
+    if _pool is None:
+        db_url = os.getenv("SUPABASE_DB_URL")
+        _pool = ThreadedConnectionPool(POOL_MIN_CONN, POOL_MAX_CONN, db_url, cursor_factory=RealDictCursor)
+
+    return _pool
+
+
+# One keep-alive HTTP pool for every REST test, so REST numbers measure
+# requests rather than TCP/TLS handshakes under concurrency
+REST_POOL_SIZE = 100
+_rest_client: Optional[Client] = None
+
+
+def get_rest_client() -> Client:
+    """Get or create a Supabase client pinned to a shared keep-alive httpx pool."""
+    global _rest_client
+
+    if _rest_client is None:
+        http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=REST_POOL_SIZE, max_keepalive_connections=REST_POOL_SIZE),
+            timeout=120,
+        )
+        _rest_client = create_client(
+            os.getenv("SUPABASE_URL"),
+            os.getenv("SUPABASE_SECRET_KEY"),
+            options=ClientOptions(httpx_client=http_client),
+        )
+
+    return _rest_client
+
+
+def close_pool():
+    """Close all pooled connections."""
+    global _pool
+
+    if _pool is not None:
+        _pool.closeall()
+        _pool = None
+
+
+def close_rest_client():
+    """Close the shared REST HTTP pool."""
+    global _rest_client
+
+    if _rest_client is not None:
+        _rest_client.options.httpx_client.close()
+        _rest_client = None
+
+
 def create_rest_select_operation():
     """Create a REST API select operation."""
-    client = get_supabase_client()
+    client = get_rest_client()
 
     def operation(i):
-        start = time.perf_counter()
+        start = time.perf_counter_ns()
         client.table('processed_prices').select('id').limit(1).execute()
-        return time.perf_counter() - start
+        return time.perf_counter_ns() - start
 
     return operation
 
 
 def create_rest_select_bulk_operation(limit=100):
     """Create a REST API bulk select operation."""
-    client = get_supabase_client()
+    client = get_rest_client()
 
     def operation(i):
-        start = time.perf_counter()
+        start = time.perf_counter_ns()
         client.table('processed_prices').select('*').limit(limit).execute()
-        return time.perf_counter() - start
+        return time.perf_counter_ns() - start
 
     return operation
 
 
+async def async_postgres_select_operation(pool, i):
+    """Async PostgreSQL select operation (asyncpg pool, binary protocol)."""
+    start = time.perf_counter_ns()
+    await pool.fetchval("SELECT id FROM processed_prices LIMIT 1")
+    return time.perf_counter_ns() - start
+
+
 def create_postgres_select_operation():
     """Create a direct PostgreSQL select operation (new connection each time)."""
     db_url = os.getenv("SUPABASE_DB_URL")
 
     def operation(i):
-        start = time.perf_counter()
+        start = time.perf_counter_ns()
         conn = psycopg2.connect(db_url, cursor_factory=RealDictCursor)
         try:
             cursor = conn.cursor()
@@ -193,7 +472,7 @@ def create_postgres_select_operation():
             cursor.close()
         finally:
             conn.close()
-        return time.perf_counter() - start
+        return time.perf_counter_ns() - start
 
     return operation
 
@@ -202,16 +481,16 @@ def create_postgres_select_pooled_operation():
     """Create a direct PostgreSQL select operation (connection reuse)."""
     db_url = os.getenv("SUPABASE_DB_URL")
     conn = psycopg2.connect(db_url, cursor_factory=RealDictCursor)
+    cursor = conn.cursor()  # Client-side cursor, reused across ops
 
     def operation(i):
-        start = time.perf_counter()
-        cursor = conn.cursor()
+        start = time.perf_counter_ns()
         cursor.execute("SELECT id FROM processed_prices LIMIT 1")
         cursor.fetchone()
-        cursor.close()
-        return time.perf_counter() - start
+        return time.perf_counter_ns() - start
 
     def teardown():
+        cursor.close()
         conn.close()
 
     return operation, teardown
@@ -221,88 +500,196 @@ def create_postgres_count_operation():
     """Create a PostgreSQL count operation."""
     db_url = os.getenv("SUPABASE_DB_URL")
     conn = psycopg2.connect(db_url, cursor_factory=RealDictCursor)
+    cursor = conn.cursor()  # Client-side cursor, reused across ops
 
     def operation(i):
-        start = time.perf_counter()
-        cursor = conn.cursor()
+        start = time.perf_counter_ns()
         cursor.execute("SELECT COUNT(*) FROM processed_prices")
         cursor.fetchone()
-        cursor.close()
-        return time.perf_counter() - start
+        return time.perf_counter_ns() - start
 
     def teardown():
+        cursor.close()
         conn.close()
 
     return operation, teardown
 
 
 def create_rest_insert_operation():
-    """Create a REST API insert operation (to a test table or with rollback)."""
-    client = get_supabase_client()
+    """Create a REST API insert operation (insert + cleanup in one RPC round-trip)."""
+    client = get_rest_client()
 
     def operation(i):
-        start = time.perf_counter()
-        # Insert into processing_errors as a test (we can clean up later)
-        test_id = str(uuid.uuid4())
-        client.table('processing_errors').insert({
-            'id': test_id,
-            'error_type': 'benchmark_test',
-            'error_message': f'Benchmark test {i}',
-            'source_path': 'benchmark/test',
-            'source_type': 'benchmark'
-        }).execute()
-        # Immediately delete to clean up
-        client.table('processing_errors').delete().eq('id', test_id).execute()
-        return time.perf_counter() - start
+        start = time.perf_counter_ns()
+        # benchmark_insert_delete (migration 038) inserts into processing_errors
+        # and deletes the row again server-side
+        client.rpc('benchmark_insert_delete', {'p_id': str(uuid.uuid4())}).execute()
+        return time.perf_counter_ns() - start
 
     return operation
 
 
+BENCHMARK_INSERT_SQL = """
+    INSERT INTO processing_errors (error_type, error_message, source_path, source_type)
+    VALUES (%s, %s, %s, %s)
+"""
+
+
 def create_postgres_insert_operation():
-    """Create a PostgreSQL insert operation with rollback."""
+    """Create a PostgreSQL insert operation (server-side prepared statement) with rollback."""
     db_url = os.getenv("SUPABASE_DB_URL")
     conn = psycopg2.connect(db_url, cursor_factory=RealDictCursor)
     conn.autocommit = False
+    cursor = conn.cursor()
 
-    def operation(i):
-        start = time.perf_counter()
-        cursor = conn.cursor()
+    if is_pooler_url(db_url):
+        # A PREPARE may not be visible to the next transaction through the pooler
+        print("  (pooler connection: timing a parameterized INSERT instead of PREPARE/EXECUTE)")
+        statement = BENCHMARK_INSERT_SQL
+    else:
+        # PREPARE is session-scoped and survives the per-op rollbacks
         cursor.execute("""
+            PREPARE bench_ins AS
             INSERT INTO processing_errors (error_type, error_message, source_path, source_type)
-            VALUES ('benchmark_test', 'Benchmark test', 'benchmark/test', 'benchmark')
+            VALUES ($1, $2, $3, $4)
         """)
+        conn.commit()
+        statement = "EXECUTE bench_ins(%s, %s, %s, %s)"
+
+    def operation(i):
+        start = time.perf_counter_ns()
+        cursor.execute(
+            statement,
+            ('benchmark_test', f'Benchmark test {i}', 'benchmark/test', 'benchmark')
+        )
         conn.rollback()  # Don't actually insert
+        return time.perf_counter_ns() - start
+
+    def teardown():
         cursor.close()
-        return time.perf_counter() - start
+        conn.close()
+
+    return operation, teardown
+
+
+def create_postgres_batch_insert_operation(batch_size=100):
+    """Create a PostgreSQL batched insert operation (execute_batch) with rollback."""
+    db_url = os.getenv("SUPABASE_DB_URL")
+    conn = psycopg2.connect(db_url, cursor_factory=RealDictCursor)
+    conn.autocommit = False
+    cursor = conn.cursor()
+
+    def operation(i):
+        rows = [
+            ('benchmark_test', f'Benchmark test {i}-{j}', 'benchmark/test', 'benchmark')
+            for j in range(batch_size)
+        ]
+        start = time.perf_counter_ns()
+        execute_batch(cursor, BENCHMARK_INSERT_SQL, rows, page_size=batch_size)
+        conn.rollback()  # Don't actually insert
+        return time.perf_counter_ns() - start
 
     def teardown():
+        cursor.close()
         conn.close()
 
     return operation, teardown
 
 
-def create_concurrent_connection_operation():
-    """Create an operation that tests concurrent connection handling."""
+def create_postgres_copy_operation(rows=100):
+    """Create a PostgreSQL COPY FROM STDIN bulk-write operation with rollback."""
     db_url = os.getenv("SUPABASE_DB_URL")
+    conn = psycopg2.connect(db_url, cursor_factory=RealDictCursor)
+    conn.autocommit = False
+    cursor = conn.cursor()
+
+    payload = "".join(
+        f"benchmark_test\tBenchmark test {j}\tbenchmark/test\tbenchmark\n" for j in range(rows)
+    ).encode()
 
     def operation(i):
-        start = time.perf_counter()
-        conn = psycopg2.connect(db_url, cursor_factory=RealDictCursor)
+        start = time.perf_counter_ns()
+        cursor.copy_expert(
+            "COPY processing_errors (error_type, error_message, source_path, source_type) FROM STDIN",
+            io.BytesIO(payload)
+        )
+        conn.rollback()  # Don't actually insert
+        return time.perf_counter_ns() - start
+
+    def teardown():
+        cursor.close()
+        conn.close()
+
+    return operation, teardown
+
+
+CONNECTION_HOLD_SEC = 0.1
+
+
+def create_concurrent_connection_operation(hold_sec: float = CONNECTION_HOLD_SEC):
+    """
+    Create an operation that tests concurrent connection handling (pooled connections).
+
+    Only acquire + query is timed; the connection is then held for `hold_sec`
+    outside the measured region to keep concurrent connections open.
+    """
+    pool = get_pool()
+
+    def operation(i):
+        start = time.perf_counter_ns()
+        conn = pool.getconn()
         try:
             cursor = conn.cursor()
             cursor.execute("SELECT 1")
             cursor.fetchone()
+            elapsed = time.perf_counter_ns() - start
             cursor.close()
-            time.sleep(0.1)  # Hold connection briefly
+            time.sleep(hold_sec)  # Hold connection briefly (not measured)
         finally:
-            conn.close()
-        return time.perf_counter() - start
+            pool.putconn(conn)
+        return elapsed
 
     return operation
 
 
-def run_all_benchmarks() -> List[BenchmarkResult]:
-    """Run all benchmark tests."""
+@dataclass
+class TestSpec:
+    """A sequential benchmark test that can run in its own worker process."""
+    name: str
+    factory: Callable
+    factory_args: tuple
+    num_operations: int
+
+
+# Tests 1, 3-6: independent connections/endpoints, safe to run side by side
+INDEPENDENT_TESTS = [
+    TestSpec("REST API SELECT (sequential)", create_rest_select_operation, (), 50),
+    TestSpec("REST API SELECT 100 rows", create_rest_select_bulk_operation, (100,), 30),
+    TestSpec("PostgreSQL SELECT (new conn)", create_postgres_select_operation, (), 30),
+    TestSpec("PostgreSQL SELECT (pooled)", create_postgres_select_pooled_operation, (), 100),
+    TestSpec("PostgreSQL COUNT(*)", create_postgres_count_operation, (), 20),
+]
+PARALLEL_WORKERS = 4
+
+
+def run_spec(spec: TestSpec) -> BenchmarkResult:
+    """Build a test's operation and run it (top-level so worker processes can pickle it)."""
+    print(f"Running: {spec.name}...")
+    created = spec.factory(*spec.factory_args)
+    op, teardown = created if isinstance(created, tuple) else (created, None)
+    result = run_benchmark(spec.name, op, num_operations=spec.num_operations, teardown_func=teardown)
+    print(f"  {spec.name} QPS: {result.qps:.1f}, Avg Latency: {result.avg_latency_ms:.1f}ms")
+    return result
+
+
+def run_all_benchmarks(parallel: bool = False) -> List[BenchmarkResult]:
+    """
+    Run all benchmark tests.
+
+    Args:
+        parallel: Run the independent sequential tests in worker processes.
+            Shortens wall time, but the tests then share client CPU and network.
+    """
     results = []
 
     print("=" * 70)
@@ -311,15 +698,12 @@ def run_all_benchmarks() -> List[BenchmarkResult]:
     print(f"Started: {datetime.now().isoformat()}")
     print()
 
-    # Test 1: REST API Simple SELECT (Sequential)
-    print("Running: REST API Simple SELECT (Sequential)...")
-    results.append(run_benchmark(
-        "REST API SELECT (sequential)",
-        create_rest_select_operation(),
-        num_operations=50,
-        concurrency=1
-    ))
-    print(f"  QPS: {results[-1].qps:.1f}, Avg Latency: {results[-1].avg_latency_ms:.1f}ms")
+    # Tests 1, 3-6: independent sequential tests
+    if parallel:
+        with multiprocessing.Pool(PARALLEL_WORKERS) as pool:
+            results.extend(pool.map(run_spec, INDEPENDENT_TESTS))
+    else:
+        results.extend(run_spec(spec) for spec in INDEPENDENT_TESTS)
 
     # Test 2: REST API Simple SELECT (Concurrent)
     for concurrency in [5, 10, 20]:
@@ -332,31 +716,32 @@ def run_all_benchmarks() -> List[BenchmarkResult]:
         ))
         print(f"  QPS: {results[-1].qps:.1f}, Avg Latency: {results[-1].avg_latency_ms:.1f}ms, Failed: {results[-1].failed}")
 
-    # Test 3: REST API Bulk SELECT
-    print("Running: REST API Bulk SELECT (100 rows)...")
-    results.append(run_benchmark(
-        "REST API SELECT 100 rows",
-        create_rest_select_bulk_operation(100),
-        num_operations=30,
-        concurrency=1
-    ))
-    print(f"  QPS: {results[-1].qps:.1f}, Avg Latency: {results[-1].avg_latency_ms:.1f}ms")
+    # Test 5b: PostgreSQL SELECT (Concurrent, asyncio + asyncpg)
+    for concurrency in [5, 10, 20]:
+        print(f"Running: PostgreSQL SELECT asyncpg (concurrency={concurrency})...")
+        results.append(run_async_benchmark(
+            f"PostgreSQL SELECT asyncpg (c={concurrency})",
+            async_postgres_select_operation,
+            num_operations=100,
+            concurrency=concurrency
+        ))
+        print(f"  QPS: {results[-1].qps:.1f}, Avg Latency: {results[-1].avg_latency_ms:.1f}ms, Failed: {results[-1].failed}")
 
-    # Test 4: PostgreSQL Direct (New Connection Each Time)
-    print("Running: PostgreSQL SELECT (new connection each)...")
+    # Test 7: REST API INSERT + DELETE (single RPC)
+    print("Running: REST API INSERT + DELETE (RPC)...")
     results.append(run_benchmark(
-        "PostgreSQL SELECT (new conn)",
-        create_postgres_select_operation(),
-        num_operations=30,
+        "REST API INSERT+DELETE (RPC)",
+        create_rest_insert_operation(),
+        num_operations=20,
         concurrency=1
     ))
     print(f"  QPS: {results[-1].qps:.1f}, Avg Latency: {results[-1].avg_latency_ms:.1f}ms")
 
-    # Test 5: PostgreSQL Direct (Connection Reuse)
-    print("Running: PostgreSQL SELECT (pooled connection)...")
-    op, teardown = create_postgres_select_pooled_operation()
+    # Test 8: PostgreSQL INSERT (with rollback)
+    print("Running: PostgreSQL INSERT (rollback)...")
+    op, teardown = create_postgres_insert_operation()
     results.append(run_benchmark(
-        "PostgreSQL SELECT (pooled)",
+        "PostgreSQL INSERT (rollback)",
         op,
         num_operations=100,
         concurrency=1,
@@ -364,39 +749,33 @@ def run_all_benchmarks() -> List[BenchmarkResult]:
     ))
     print(f"  QPS: {results[-1].qps:.1f}, Avg Latency: {results[-1].avg_latency_ms:.1f}ms")
 
-    # Test 6: PostgreSQL COUNT (heavier query)
-    print("Running: PostgreSQL COUNT (full table scan)...")
-    op, teardown = create_postgres_count_operation()
+    # Test 8b: PostgreSQL batched INSERT (execute_batch, with rollback)
+    print("Running: PostgreSQL INSERT batch of 100 (rollback)...")
+    op, teardown = create_postgres_batch_insert_operation(100)
     results.append(run_benchmark(
-        "PostgreSQL COUNT(*)",
+        "PostgreSQL INSERT batch 100 (rollback)",
         op,
         num_operations=20,
         concurrency=1,
-        teardown_func=teardown
-    ))
-    print(f"  QPS: {results[-1].qps:.1f}, Avg Latency: {results[-1].avg_latency_ms:.1f}ms")
-
-    # Test 7: REST API INSERT + DELETE
-    print("Running: REST API INSERT + DELETE...")
-    results.append(run_benchmark(
-        "REST API INSERT+DELETE",
-        create_rest_insert_operation(),
-        num_operations=20,
-        concurrency=1
+        teardown_func=teardown,
+        rows_per_op=100
     ))
-    print(f"  QPS: {results[-1].qps:.1f}, Avg Latency: {results[-1].avg_latency_ms:.1f}ms")
+    print(f"  QPS: {results[-1].qps:.1f} ({results[-1].rows_per_sec:.0f} rows/s), "
+          f"Avg Latency: {results[-1].avg_latency_ms:.1f}ms")
 
-    # Test 8: PostgreSQL INSERT (with rollback)
-    print("Running: PostgreSQL INSERT (rollback)...")
-    op, teardown = create_postgres_insert_operation()
+    # Test 8c: PostgreSQL COPY (with rollback)
+    print("Running: PostgreSQL COPY 100 rows (rollback)...")
+    op, teardown = create_postgres_copy_operation(100)
     results.append(run_benchmark(
-        "PostgreSQL INSERT (rollback)",
+        "PostgreSQL COPY 100 rows (rollback)",
         op,
-        num_operations=100,
+        num_operations=20,
         concurrency=1,
-        teardown_func=teardown
+        teardown_func=teardown,
+        rows_per_op=100
     ))
-    print(f"  QPS: {results[-1].qps:.1f}, Avg Latency: {results[-1].avg_latency_ms:.1f}ms")
+    print(f"  QPS: {results[-1].qps:.1f} ({results[-1].rows_per_sec:.0f} rows/s), "
+          f"Avg Latency: {results[-1].avg_latency_ms:.1f}ms")
 
     # Test 9: Concurrent Connections Stress Test
     for concurrency in [10, 20, 30, 40]:
@@ -427,6 +806,7 @@ def generate_report(results: List[BenchmarkResult]) -> str:
         "",
         f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
         f"**Instance:** Micro (1 GB RAM, 2-core ARM CPU)",
+        f"**REST transport:** one shared keep-alive httpx pool ({REST_POOL_SIZE} connections) for all REST tests",
         "",
         "## Summary",
         "",
@@ -439,11 +819,26 @@ def generate_report(results: List[BenchmarkResult]) -> str:
         "|------|------------|---------|--------|-----|----------|----------|----------|",
     ]
 
+    # Single pass: emit the results table and bucket results by category
+    rest_reads, pg_reads, writes, conn_tests, errors_found = [], [], [], [], []
     for r in results:
         lines.append(
             f"| {r.name} | {r.total_operations} | {r.successful} | {r.failed} | "
             f"{r.qps:.1f} | {r.avg_latency_ms:.1f} | {r.p95_latency_ms:.1f} | {r.p99_latency_ms:.1f} |"
         )
+        if r.is_rest_read:
+            rest_reads.append(r)
+        if r.is_pg_read:
+            pg_reads.append(r)
+        if r.is_write:
+            writes.append(r)
+        if r.is_conn_test:
+            conn_tests.append(r)
+        if r.errors:
+            errors_found.append(r)
+
+    best_rest = max(rest_reads, key=lambda r: r.qps) if rest_reads else None
+    best_pg = max(pg_reads, key=lambda r: r.qps) if pg_reads else None
 
     lines.extend([
         "",
@@ -454,14 +849,10 @@ def generate_report(results: List[BenchmarkResult]) -> str:
     ])
 
     # Analyze read operations
-    rest_reads = [r for r in results if "REST API SELECT" in r.name and "INSERT" not in r.name]
-    if rest_reads:
-        best_rest = max(rest_reads, key=lambda r: r.qps)
+    if best_rest:
         lines.append(f"- **Best REST API read throughput:** {best_rest.qps:.1f} QPS ({best_rest.name})")
 
-    pg_reads = [r for r in results if "PostgreSQL SELECT" in r.name]
-    if pg_reads:
-        best_pg = max(pg_reads, key=lambda r: r.qps)
+    if best_pg:
         lines.append(f"- **Best PostgreSQL read throughput:** {best_pg.qps:.1f} QPS ({best_pg.name})")
 
     lines.extend([
@@ -470,10 +861,9 @@ def generate_report(results: List[BenchmarkResult]) -> str:
         "",
     ])
 
-    writes = [r for r in results if "INSERT" in r.name]
-    if writes:
-        for w in writes:
-            lines.append(f"- **{w.name}:** {w.qps:.1f} QPS, {w.avg_latency_ms:.1f}ms avg latency")
+    for w in writes:
+        rows = f" ({w.rows_per_sec:.0f} rows/s, {w.rows_per_op} rows/op)" if w.rows_per_op > 1 else ""
+        lines.append(f"- **{w.name}:** {w.qps:.1f} QPS{rows}, {w.avg_latency_ms:.1f}ms avg latency")
 
     lines.extend([
         "",
@@ -481,9 +871,9 @@ def generate_report(results: List[BenchmarkResult]) -> str:
         "",
     ])
 
-    conn_tests = [r for r in results if "Concurrent Connections" in r.name]
     if conn_tests:
-        max_successful = max(conn_tests, key=lambda r: r.successful if r.failed == 0 else 0)
+        lines.append(f"- Latency covers acquire + `SELECT 1` only; each connection is then held "
+                     f"{CONNECTION_HOLD_SEC * 1000:.0f}ms outside the measurement")
         failing = [r for r in conn_tests if r.failed > 0]
 
         if failing:
@@ -507,18 +897,16 @@ def generate_report(results: List[BenchmarkResult]) -> str:
         bottlenecks.append("**Connection Pool**: Connection failures observed at higher concurrency levels.")
 
     # Check REST vs PostgreSQL
-    if rest_reads and pg_reads:
-        best_rest_qps = max(r.qps for r in rest_reads)
-        best_pg_qps = max(r.qps for r in pg_reads)
-        if best_pg_qps > best_rest_qps * 2:
-            bottlenecks.append("**REST API Overhead**: Direct PostgreSQL is significantly faster than REST API.")
+    if best_rest and best_pg and best_pg.qps > best_rest.qps * 2:
+        bottlenecks.append("**REST API Overhead**: Direct PostgreSQL is significantly faster than REST API.")
 
     # Check write performance
     if writes:
-        avg_write_qps = statistics.mean(w.qps for w in writes)
+        # Rows/s so batched writes and COPY count every row, not one write per op
+        avg_write_rows_per_sec = statistics.mean(w.rows_per_sec for w in writes)
         if rest_reads:
             avg_read_qps = statistics.mean(r.qps for r in rest_reads)
-            if avg_write_qps < avg_read_qps * 0.3:
+            if avg_write_rows_per_sec < avg_read_qps * 0.3:
                 bottlenecks.append("**Write Performance**: Writes are significantly slower than reads (expected).")
 
     if bottlenecks:
@@ -538,11 +926,8 @@ def generate_report(results: List[BenchmarkResult]) -> str:
     # Generate recommendations
     recommendations = []
 
-    if pg_reads and rest_reads:
-        best_pg_qps = max(r.qps for r in pg_reads)
-        best_rest_qps = max(r.qps for r in rest_reads)
-        if best_pg_qps > best_rest_qps * 1.5:
-            recommendations.append("1. **Use direct PostgreSQL connections** for bulk operations instead of REST API")
+    if best_pg and best_rest and best_pg.qps > best_rest.qps * 1.5:
+        recommendations.append("1. **Use direct PostgreSQL connections** for bulk operations instead of REST API")
 
     recommendations.extend([
         "2. **Implement connection pooling** (e.g., PgBouncer) for higher concurrency",
@@ -570,7 +955,6 @@ def generate_report(results: List[BenchmarkResult]) -> str:
         )
 
     # Add errors section if any
-    errors_found = [r for r in results if r.errors]
     if errors_found:
         lines.extend([
             "",
@@ -589,10 +973,12 @@ def main():
     parser = argparse.ArgumentParser(description="Benchmark Supabase backend QPS")
     parser.add_argument("--output", type=str, default="exports/benchmark_results.md",
                         help="Output file path for the report")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Run independent sequential tests in parallel worker processes")
     args = parser.parse_args()
 
     try:
-        results = run_all_benchmarks()
+        results = run_all_benchmarks(parallel=args.parallel)
 
         # Generate report
         report = generate_report(results)
@@ -608,6 +994,8 @@ def main():
         print("\n" + report)
 
     finally:
+        close_pool()
+        close_rest_client()
         close_connections()
 
 
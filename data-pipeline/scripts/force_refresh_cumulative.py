@@ -24,8 +24,6 @@ _HERE = Path(__file__).resolve().parent
 sys.path.insert(0, str(_HERE.parent))
 load_dotenv(_HERE.parent / ".env")
 
-from backend.supabase_client import get_supabase_client  # noqa: E402
-
 # (download_link, destination_table, storage_kind)
 TARGETS = [
     ("https://www.dane.gov.co/files/operaciones/SIPSA/anex-SIPSArroz-SerieHistoricaPrecio-2026.xlsx",
@@ -40,23 +38,30 @@ TARGETS = [
 
 
 def main() -> None:
-    sb = get_supabase_client()
     conn = psycopg2.connect(os.environ["SUPABASE_DB_URL"])
     conn.autocommit = True
     with conn.cursor() as cur:
         cur.execute("SET statement_timeout = '600s'")
     conn.autocommit = False
 
+    # One lookup for every target instead of one round-trip per URL
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT DISTINCT ON (download_link) download_link, id, storage_path "
+            "FROM download_entries WHERE download_link = ANY(%s)",
+            ([url for url, _, _ in TARGETS],),
+        )
+        entries = {link: (eid, path) for link, eid, path in cur.fetchall()}
+    conn.commit()
+
     for url, dest_table, kind in TARGETS:
         filename = url.rsplit("/", 1)[-1]
         print(f"\n=== {filename} ===")
-        existing = sb.table("download_entries").select("id, storage_path").eq("download_link", url).execute().data
-        if not existing:
+        entry = entries.get(url)
+        if not entry:
             print("  no entry, nothing to do")
             continue
-        entry = existing[0]
-        eid = entry["id"]
-        storage_path = entry["storage_path"]
+        eid, storage_path = entry
         print(f"  entry_id={eid}")
         print(f"  storage_path={storage_path}")
 
@@ -83,6 +88,8 @@ def main() -> None:
         n = batch_delete(dest_table)
         print(f"  deleted {n} rows from {dest_table}")
 
+        # Drop the entry as soon as its children are gone so an interrupted run
+        # never leaves a "fresh" entry pointing at deleted data
         with conn.cursor() as cur:
             cur.execute("DELETE FROM download_entries WHERE id = %s", (eid,))
         conn.commit()
@@ -11,6 +11,7 @@ Usage:
 import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 
@@ -19,7 +20,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from backend.supabase_client import get_db_connection, close_connections
 from config import STORAGE_BUCKET
 
-# Error types to exclude (transient/retryable errors)
+# Error types to exclude (transient/retryable errors).
+# The report filters with the is_transient() SQL function (migration 040); keep
+# these lists and that function in sync.
 TRANSIENT_ERROR_TYPES = {
     'upload_transient',
     'upload_duplicate',
@@ -43,6 +46,13 @@ TRANSIENT_ERROR_MESSAGES = [
     'duplicate',
 ]
 
+# Rows listed per error type; the rest are only counted
+ROWS_PER_TYPE = 50
+
+# Markdown table cell escaping: pipes would split the cell, newlines end the row.
+# Applied after slicing, so a cut can never leave a dangling backslash.
+_MD_ESCAPE = str.maketrans({'|': '\\|', '\n': ' ', '\r': ' '})
+
 
 def get_storage_base_url():
     """Get the Supabase storage base URL."""
@@ -52,24 +62,29 @@ def get_storage_base_url():
     return None
 
 
-def is_transient_error(error_type: str, error_message: str) -> bool:
-    """Check if an error is transient and should be excluded."""
-    if error_type in TRANSIENT_ERROR_TYPES:
-        return True
-
-    msg_lower = (error_message or '').lower()
-    return any(t in msg_lower for t in TRANSIENT_ERROR_MESSAGES)
+def _fetch_error_groups(name: str, sql: str, cutoff) -> list:
+    """Run one grouped error query on its own connection."""
+    conn = get_db_connection(new_connection=True)
+    try:
+        # Server-side cursor: groups stream in batches instead of one fetchall()
+        cursor = conn.cursor(name=name)
+        cursor.itersize = 500
+        cursor.execute(sql, {'rows_per_type': ROWS_PER_TYPE, 'cutoff': cutoff})
+
+        groups = [
+            {'error_type': row['error_type'], 'count': row['error_count'], 'errors': row['errors'] or []}
+            for row in cursor
+        ]
+
+        cursor.close()
+        return groups
+    finally:
+        conn.close()
 
 
 def get_errors(hours_ago: int = None):
     """Get errors from database, optionally filtered by time."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    time_filter = ""
-    if hours_ago:
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
-        time_filter = f"AND created_at >= '{cutoff.isoformat()}'"
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_ago) if hours_ago else None
 
     results = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
@@ -79,83 +94,99 @@ def get_errors(hours_ago: int = None):
         "processing_errors": [],
     }
 
-    # Download errors - get full URL for downloading
-    cursor.execute(f"""
-        SELECT de.error_type, de.download_url, de.error_code, de.error_message,
-               de.file_type, de.retry_count, de.created_at, de.source_page
+    # Download errors grouped by type, largest group first. Each group carries its
+    # total count and the most recent rows (with full URL for downloading)
+    download_sql = """
+        SELECT COALESCE(de.error_type, 'unknown') AS error_type,
+               COUNT(*) AS error_count,
+               (array_agg(json_build_object(
+                   'download_url', de.download_url,
+                   'error_message', de.error_message,
+                   'source_page', de.source_page
+               ) ORDER BY de.created_at DESC))[1:%(rows_per_type)s] AS errors
         FROM download_errors de
-        LEFT JOIN download_entries dn ON de.download_url = dn.download_link
-        WHERE de.resolved = FALSE AND dn.id IS NULL
-              {time_filter.replace('created_at', 'de.created_at')}
-        ORDER BY de.error_type, de.created_at DESC
-    """)
-
-    for row in cursor.fetchall():
-        row_dict = dict(row)
-        # Filter out transient errors
-        if not is_transient_error(row_dict.get('error_type', ''), row_dict.get('error_message', '')):
-            results["download_errors"].append(row_dict)
+        WHERE de.resolved = FALSE
+              AND NOT EXISTS (SELECT 1 FROM download_entries dn WHERE dn.download_link = de.download_url)
+              AND NOT is_transient(de.error_type, de.error_message)
+              AND (%(cutoff)s::timestamptz IS NULL OR de.created_at >= %(cutoff)s)
+        GROUP BY 1
+        ORDER BY error_count DESC, error_type
+    """
 
     # Processing errors - join with download_entries and extracted_pdfs to get storage paths
-    cursor.execute(f"""
-        SELECT pe.error_type, pe.source_path, pe.source_type, pe.error_message,
-               pe.retry_count, pe.created_at, pe.download_entry_id, pe.extracted_pdf_id,
-               de.storage_path as download_storage_path, de.download_link,
-               ep.storage_path as extracted_storage_path, ep.pdf_filename
+    processing_sql = """
+        SELECT COALESCE(pe.error_type, 'unknown') AS error_type,
+               COUNT(*) AS error_count,
+               (array_agg(json_build_object(
+                   'source_path', pe.source_path,
+                   'error_message', pe.error_message,
+                   'download_storage_path', de.storage_path,
+                   'extracted_storage_path', ep.storage_path
+               ) ORDER BY pe.created_at DESC))[1:%(rows_per_type)s] AS errors
         FROM processing_errors pe
         LEFT JOIN download_entries de ON pe.download_entry_id = de.id
         LEFT JOIN extracted_pdfs ep ON pe.extracted_pdf_id = ep.id
-        LEFT JOIN processed_prices pp ON pe.source_path = pp.source_path
-        WHERE pe.resolved = FALSE AND pp.id IS NULL
-              {time_filter.replace('created_at', 'pe.created_at')}
-        ORDER BY pe.error_type, pe.created_at DESC
-    """)
-
-    for row in cursor.fetchall():
-        row_dict = dict(row)
-        # Filter out transient errors
-        if not is_transient_error(row_dict.get('error_type', ''), row_dict.get('error_message', '')):
-            results["processing_errors"].append(row_dict)
+        WHERE pe.resolved = FALSE
+              AND NOT EXISTS (SELECT 1 FROM processed_prices pp WHERE pp.source_path = pe.source_path)
+              AND NOT is_transient(pe.error_type, pe.error_message)
+              AND (%(cutoff)s::timestamptz IS NULL OR pe.created_at >= %(cutoff)s)
+        GROUP BY 1
+        ORDER BY error_count DESC, error_type
+    """
+
+    # The two queries are independent; run them side by side on separate
+    # connections so wall time is the slower query, not the sum
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        download_future = executor.submit(_fetch_error_groups, 'download_errors_cur', download_sql, cutoff)
+        processing_future = executor.submit(_fetch_error_groups, 'processing_errors_cur', processing_sql, cutoff)
+        results["download_errors"] = download_future.result()
+        results["processing_errors"] = processing_future.result()
 
     return results
 
 
-def generate_report(results: dict) -> str:
-    """Generate markdown report from results with file links."""
-    lines = []
+def _truncate(text: str, limit: int = 50) -> str:
+    """Shorten text for a table cell, marking the cut with an ellipsis."""
+    return text[:limit] + '...' if len(text) > limit else text
+
+
+def count_errors(groups: list) -> int:
+    """Total number of errors across grouped results."""
+    return sum(group['count'] for group in groups)
+
+
+def generate_report(results: dict):
+    """Generate markdown report lines from results with file links."""
     storage_base = results.get('storage_base_url')
+    storage_prefix = f"{storage_base}/{STORAGE_BUCKET}/" if storage_base else None
 
     time_note = f" (last {results['hours_filter']} hours)" if results['hours_filter'] else ""
-    lines.append(f"# Pipeline Error Report{time_note}")
-    lines.append(f"\n**Generated:** {results['generated_at']}")
-    lines.append("\n> Note: Transient errors (network issues, rate limits) and 'already processed' errors are excluded from this report.")
+    yield f"# Pipeline Error Report{time_note}"
+    yield f"\n**Generated:** {results['generated_at']}"
+    yield "\n> Note: Transient errors (network issues, rate limits) and 'already processed' errors are excluded from this report."
 
     # Summary
-    lines.append("\n## Summary\n")
-    lines.append("| Category | Count |")
-    lines.append("|----------|------:|")
-    lines.append(f"| Download Errors | {len(results['download_errors'])} |")
-    lines.append(f"| Processing Errors | {len(results['processing_errors'])} |")
+    yield "\n## Summary\n"
+    yield "| Category | Count |"
+    yield "|----------|------:|"
+    yield f"| Download Errors | {count_errors(results['download_errors'])} |"
+    yield f"| Processing Errors | {count_errors(results['processing_errors'])} |"
 
     # Download Errors
     if results['download_errors']:
-        lines.append("\n## Download Errors\n")
-        lines.append("These files failed to download from the DANE website.\n")
-
-        by_type = {}
-        for err in results['download_errors']:
-            etype = err.get('error_type', 'unknown')
-            by_type.setdefault(etype, []).append(err)
+        yield "\n## Download Errors\n"
+        yield "These files failed to download from the DANE website.\n"
 
-        for etype, errors in sorted(by_type.items(), key=lambda x: -len(x[1])):
-            lines.append(f"\n### {etype} ({len(errors)})\n")
-            lines.append("| File | Error | Source Link |")
-            lines.append("|------|-------|-------------|")
+        for group in results['download_errors']:
+            etype, count, errors = group['error_type'], group['count'], group['errors']
+            yield f"\n### {etype} ({count})\n"
+            yield "| File | Error | Source Link |"
+            yield "|------|-------|-------------|"
 
-            for err in errors[:50]:  # Limit to 50 per type
+            for err in errors:  # Already limited to ROWS_PER_TYPE in SQL
                 url = err.get('download_url', '')
-                filename = url.split('/')[-1] if url else 'N/A'
-                msg = (err.get('error_message', '') or '')[:80].replace('|', '\\|')
+                filename = url.rpartition('/')[2] if url else 'N/A'
+                msg = (err.get('error_message') or '')[:80].translate(_MD_ESCAPE)
                 source = err.get('source_page', '')
 
                 # Create clickable link to source file
@@ -165,23 +196,19 @@ def generate_report(results: dict) -> str:
                     file_link = filename
 
                 source_link = f"[source]({source})" if source else "-"
-                lines.append(f"| {file_link} | {msg} | {source_link} |")
+                yield f"| {file_link} | {msg} | {source_link} |"
 
-            if len(errors) > 50:
-                lines.append(f"\n*... and {len(errors) - 50} more errors of this type*")
+            if count > len(errors):
+                yield f"\n*... and {count - len(errors)} more errors of this type*"
 
     # Processing Errors
     if results['processing_errors']:
-        lines.append("\n## Processing Errors\n")
-        lines.append("These files were downloaded but failed during processing.\n")
+        yield "\n## Processing Errors\n"
+        yield "These files were downloaded but failed during processing.\n"
 
-        by_type = {}
-        for err in results['processing_errors']:
-            etype = err.get('error_type', 'unknown')
-            by_type.setdefault(etype, []).append(err)
-
-        for etype, errors in sorted(by_type.items(), key=lambda x: -len(x[1])):
-            lines.append(f"\n### {etype} ({len(errors)})\n")
+        for group in results['processing_errors']:
+            etype, count, errors = group['error_type'], group['count'], group['errors']
+            yield f"\n### {etype} ({count})\n"
 
             # Add description for each error type
             descriptions = {
@@ -194,45 +221,42 @@ def generate_report(results: dict) -> str:
                 'invalid_city_headers': 'PDF table headers could not be parsed.',
             }
             if etype in descriptions:
-                lines.append(f"*{descriptions[etype]}*\n")
+                yield f"*{descriptions[etype]}*\n"
 
-            lines.append("| File | Storage Path | Error |")
-            lines.append("|------|--------------|-------|")
+            yield "| File | Storage Path | Error |"
+            yield "|------|--------------|-------|"
 
-            for err in errors[:50]:
+            for err in errors:
                 source_path = err.get('source_path', '')
-                filename = source_path.split('/')[-1] if source_path else 'N/A'
-                msg = (err.get('error_message', '') or '')[:100].replace('|', '\\|').replace('\n', ' ')
+                filename = source_path.rpartition('/')[2] if source_path else 'N/A'
+                msg = (err.get('error_message') or '')[:80].translate(_MD_ESCAPE)
 
                 # Get storage path for download link
                 storage_path = err.get('extracted_storage_path') or err.get('download_storage_path') or source_path
 
                 # Create clickable link if we have storage base URL
-                if storage_base and storage_path:
-                    full_url = f"{storage_base}/{STORAGE_BUCKET}/{storage_path}"
-                    file_link = f"[{filename}]({full_url})"
-                    path_display = f"`{storage_path[:50]}...`" if len(storage_path) > 50 else f"`{storage_path}`"
+                if storage_prefix and storage_path:
+                    file_link = f"[{filename}]({storage_prefix + storage_path})"
+                    path_display = f"`{_truncate(storage_path)}`"
                 else:
                     file_link = f"`{filename}`"
-                    path_display = f"`{source_path[:50]}...`" if source_path and len(source_path) > 50 else f"`{source_path or 'N/A'}`"
+                    path_display = f"`{_truncate(source_path) if source_path else 'N/A'}`"
 
-                lines.append(f"| {file_link} | {path_display} | {msg[:80]} |")
+                yield f"| {file_link} | {path_display} | {msg} |"
 
-            if len(errors) > 50:
-                lines.append(f"\n*... and {len(errors) - 50} more errors of this type*")
+            if count > len(errors):
+                yield f"\n*... and {count - len(errors)} more errors of this type*"
 
     if not any([results['download_errors'], results['processing_errors']]):
-        lines.append("\n**No errors found (excluding transient errors).**")
+        yield "\n**No errors found (excluding transient errors).**"
 
     # Add instructions
-    lines.append("\n---\n")
-    lines.append("## How to Investigate\n")
-    lines.append("1. Click on file links to download and inspect the problematic files")
-    lines.append("2. For **download errors**: The file may not exist on DANE's website")
-    lines.append("3. For **processing errors**: Download the file and check its format")
-    lines.append("4. Use `python -m cli.main download-errors -o ./error_files` to batch download files with errors")
-
-    return "\n".join(lines)
+    yield "\n---\n"
+    yield "## How to Investigate\n"
+    yield "1. Click on file links to download and inspect the problematic files"
+    yield "2. For **download errors**: The file may not exist on DANE's website"
+    yield "3. For **processing errors**: Download the file and check its format"
+    yield "4. Use `python -m cli.main download-errors -o ./error_files` to batch download files with errors"
 
 
 def main():
@@ -248,14 +272,13 @@ def main():
         results = get_errors(hours_ago=args.recent)
 
         print(f"Found:")
-        print(f"  - {len(results['download_errors'])} download errors")
-        print(f"  - {len(results['processing_errors'])} processing errors")
-
-        report = generate_report(results)
+        print(f"  - {count_errors(results['download_errors'])} download errors")
+        print(f"  - {count_errors(results['processing_errors'])} processing errors")
 
         output_path = Path(__file__).parent.parent / args.output
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(report)
+        with output_path.open('w') as fh:
+            fh.writelines(f"{line}\n" for line in generate_report(results))
 
         print(f"\nReport saved to: {output_path}")
 
@@ -11,15 +11,31 @@ Usage:
 """
 
 import argparse
+import bisect
+import calendar
+import pickle
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import date, timedelta
-from collections import defaultdict
+from datetime import date
+from itertools import groupby
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; get_expected_dates falls back to pure Python
+    np = None
+from psycopg2.extensions import cursor as TupleCursor
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.supabase_client import get_db_connection, close_connections
 
+# Holidays and expected business days only depend on the date range, so they
+# are cached on disk between runs
+CACHE_DIR = Path.home() / ".cache" / "agro-amigo"
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
 # Colombian national holidays by year (2020-2026)
 # Source: Official Colombian holiday calendar
 COLOMBIAN_HOLIDAYS = {
@@ -165,164 +181,295 @@ COLOMBIAN_HOLIDAYS = {
 }
 
 
-def get_colombian_holidays(year: int) -> set:
+# Every holiday in COLOMBIAN_HOLIDAYS, built once at import and kept sorted so
+# ranges can be sliced with bisect
+ALL_HOLIDAYS_SORTED = sorted(
+    date(year, month, day)
+    for year, days in COLOMBIAN_HOLIDAYS.items()
+    for month, day in days
+)
+
+
+def holidays_between(start_date: date, end_date: date) -> list:
+    """Get holidays within [start_date, end_date], in calendar order."""
+    lo = bisect.bisect_left(ALL_HOLIDAYS_SORTED, start_date)
+    hi = bisect.bisect_right(ALL_HOLIDAYS_SORTED, end_date)
+    return ALL_HOLIDAYS_SORTED[lo:hi]
+
+
+def get_colombian_holidays(year: int) -> list:
     """
     Get all Colombian holidays for a given year.
     Uses hardcoded dates from official Colombian holiday calendar.
     """
-    holidays = set()
-
-    if year in COLOMBIAN_HOLIDAYS:
-        for month, day in COLOMBIAN_HOLIDAYS[year]:
-            holidays.add(date(year, month, day))
-    else:
+    if year not in COLOMBIAN_HOLIDAYS:
         print(f"Warning: No holiday data for year {year}")
+    return holidays_between(date(year, 1, 1), date(year, 12, 31))
 
-    return holidays
 
-
-def get_all_holidays(start_year: int, end_year: int) -> set:
-    """Get all Colombian holidays for a range of years."""
-    all_holidays = set()
+def get_all_holidays(start_year: int, end_year: int) -> list:
+    """Get all Colombian holidays for a range of years, in calendar order."""
     for year in range(start_year, end_year + 1):
-        all_holidays.update(get_colombian_holidays(year))
-    return all_holidays
+        if year not in COLOMBIAN_HOLIDAYS:
+            print(f"Warning: No holiday data for year {year}")
+    return holidays_between(date(start_year, 1, 1), date(end_year, 12, 31))
+
 
+def get_missing_dates_from_db(start_date: date, end_date: date, holidays: list) -> list:
+    """
+    Get business days (Monday-Saturday, excluding holidays) in range that have no
+    processed_prices rows, in calendar order.
 
-def get_price_dates_from_db() -> set:
-    """Get all unique price_date values from processed_prices table."""
+    The calendar is generated in SQL and each day is probed with EXISTS against the
+    price_date index, so only missing days are returned.
+    """
     conn = get_db_connection()
-    cursor = conn.cursor()
+    # Server-side cursor: rows stream in batches instead of one fetchall()
+    cursor = conn.cursor(name='missing_dates_cur', cursor_factory=TupleCursor)
+    cursor.itersize = 10000
+
+    cursor.execute(
+        """
+        WITH cal AS (
+            SELECT d::date AS day
+            FROM generate_series(%(start)s::date, %(end)s::date, interval '1 day') AS d
+            WHERE EXTRACT(isodow FROM d) < 7
+              AND d::date <> ALL(%(holidays)s::date[])
+        )
+        SELECT cal.day AS price_date
+        FROM cal
+        WHERE NOT EXISTS (SELECT 1 FROM processed_prices p WHERE p.price_date = cal.day)
+        ORDER BY cal.day
+        """,
+        {'start': start_date, 'end': end_date, 'holidays': list(holidays)}
+    )
+
+    dates = [row[0] for row in cursor]
+
+    cursor.close()
+    return dates
 
-    cursor.execute("SELECT DISTINCT price_date FROM processed_prices WHERE price_date IS NOT NULL ORDER BY price_date")
 
-    dates = set()
-    for row in cursor.fetchall():
-        if row['price_date']:
-            dates.add(row['price_date'])
+def get_unexpected_count_from_db(start_date: date, end_date: date, holidays: list) -> int:
+    """
+    Count Sundays and holidays in range that nevertheless have processed_prices rows.
+
+    Only those off days are probed, one EXISTS index lookup each.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor(cursor_factory=TupleCursor)
+
+    cursor.execute(
+        """
+        WITH off_days AS (
+            SELECT d::date AS day
+            FROM generate_series(%(start)s::date, %(end)s::date, interval '1 day') AS d
+            WHERE EXTRACT(isodow FROM d) = 7
+               OR d::date = ANY(%(holidays)s::date[])
+        )
+        SELECT COUNT(*) AS unexpected_count
+        FROM off_days
+        WHERE EXISTS (SELECT 1 FROM processed_prices p WHERE p.price_date = off_days.day)
+        """,
+        {'start': start_date, 'end': end_date, 'holidays': list(holidays)}
+    )
+
+    unexpected_count = cursor.fetchone()[0]
 
     cursor.close()
-    return dates
+    return unexpected_count
 
 
-def get_expected_dates(start_date: date, end_date: date, holidays: set) -> set:
+def _get_coverage_from_db(start_date: date, end_date: date, holidays: list):
+    """Run both coverage queries on one thread, sharing the database connection."""
+    missing_dates = get_missing_dates_from_db(start_date, end_date, holidays)
+    unexpected_count = get_unexpected_count_from_db(start_date, end_date, holidays)
+    return missing_dates, unexpected_count
+
+
+def _expected_dates_python(start_date: date, end_date: date, holidays) -> list:
+    """get_expected_dates without numpy, testing weekdays with ordinal arithmetic."""
+    holiday_ordinals = frozenset(h.toordinal() for h in holidays)
+
+    # Ordinal 1 (0001-01-01) was a Monday, so (ordinal - 1) % 7 gives Monday=0 ... Sunday=6.
+    # Both tests run on ints; a date is only built for days that are kept
+    return [
+        date.fromordinal(ordinal)
+        for ordinal in range(start_date.toordinal(), end_date.toordinal() + 1)
+        if (ordinal - 1) % 7 < 6 and ordinal not in holiday_ordinals
+    ]
+
+
+def get_expected_dates(start_date: date, end_date: date, holidays):
     """
     Get all expected business days (Monday-Saturday) between start and end dates,
-    excluding holidays.
+    excluding holidays, in calendar order.
+
+    Returns a datetime64[D] array, or a list of dates when numpy is not installed.
     """
-    expected = set()
-    current = start_date
+    if np is None:
+        return _expected_dates_python(start_date, end_date, holidays)
+
+    days = np.arange(np.datetime64(start_date), np.datetime64(end_date) + np.timedelta64(1, 'D'))
+
+    # 1970-01-01 was a Thursday, so (days since epoch + 3) % 7 gives Monday=0 ... Sunday=6
+    business_days = days[(days.view('i8') + 3) % 7 < 6]
+
+    holiday_arr = np.array(holidays, dtype='datetime64[D]')
+
+    # setdiff1d returns sorted output, so no separate sort is needed
+    return np.setdiff1d(business_days, holiday_arr, assume_unique=True)
 
-    while current <= end_date:
-        # Monday=0, Tuesday=1, ..., Saturday=5, Sunday=6
-        if current.weekday() < 6:  # Monday through Saturday
-            if current not in holidays:
-                expected.add(current)
-        current += timedelta(days=1)
 
-    return expected
+def _calendar_cache_path(start_date: date, end_date: date) -> Path:
+    """Cache file for one analysis range."""
+    return CACHE_DIR / f"coverage-{start_date}-{end_date}.pkl"
+
+
+def load_calendar_cache(start_date: date, end_date: date):
+    """Load cached holidays/expected dates for a range, or None if missing or stale."""
+    path = _calendar_cache_path(start_date, end_date)
+    try:
+        if time.time() - path.stat().st_mtime > CACHE_TTL_SECONDS:
+            return None
+        with path.open('rb') as fh:
+            cached = pickle.load(fh)
+    except Exception:
+        # Includes ModuleNotFoundError for a numpy array cached by a run with numpy
+        return None
+
+    # Edits to the holiday table invalidate the cache immediately
+    if cached.get('holiday_table') != COLOMBIAN_HOLIDAYS:
+        return None
+    return cached
+
+
+def save_calendar_cache(start_date: date, end_date: date, holidays: list, expected):
+    """Cache holidays/expected dates for a range and prune expired entries; failures are not fatal."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with _calendar_cache_path(start_date, end_date).open('wb') as fh:
+            pickle.dump({
+                'holiday_table': COLOMBIAN_HOLIDAYS,
+                'holidays': holidays,
+                'expected': expected,
+            }, fh)
+    except OSError as e:
+        print(f"  Warning: could not write calendar cache: {e}")
+
+    # The default end date is today, so each day's run writes a new file;
+    # drop the ones that can no longer be loaded
+    now = time.time()
+    for path in CACHE_DIR.glob('coverage-*.pkl'):
+        try:
+            if now - path.stat().st_mtime > CACHE_TTL_SECONDS:
+                path.unlink()
+        except OSError:
+            pass
 
 
 def analyze_coverage(start_date: date, end_date: date):
     """Analyze data coverage and return missing dates."""
     print(f"Analyzing coverage from {start_date} to {end_date}...")
 
-    # Get holidays
-    holidays = get_all_holidays(start_date.year, end_date.year)
-    print(f"  Identified {len(holidays)} Colombian holidays in range")
+    cached = load_calendar_cache(start_date, end_date)
+    holidays = cached['holidays'] if cached else get_all_holidays(start_date.year, end_date.year)
+
+    # The database queries only need the holidays, so run them in the
+    # background while the expected dates are computed
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        db_future = executor.submit(_get_coverage_from_db, start_date, end_date, holidays)
 
-    # Get expected dates
-    expected_dates = get_expected_dates(start_date, end_date, holidays)
-    print(f"  Expected business days (Mon-Sat, excl holidays): {len(expected_dates)}")
+        if cached:
+            expected_dates = cached['expected']
+        else:
+            expected_dates = get_expected_dates(start_date, end_date, holidays)
+            save_calendar_cache(start_date, end_date, holidays, expected_dates)
 
-    # Get actual dates from database
-    actual_dates = get_price_dates_from_db()
-    print(f"  Dates with extracted prices: {len(actual_dates)}")
+        print(f"  Identified {len(holidays)} Colombian holidays in range")
+        print(f"  Expected business days (Mon-Sat, excl holidays): {len(expected_dates)}")
 
-    # Find missing dates
-    missing_dates = expected_dates - actual_dates
+        missing_dates, unexpected_count = db_future.result()
 
-    # Also find dates we have data for but weren't expected (weekends/holidays with data)
-    unexpected_dates = actual_dates - expected_dates
+    # Every day in range with data is either an expected day that isn't missing
+    # or an unexpected one (Sunday/holiday)
+    actual_count = len(expected_dates) - len(missing_dates) + unexpected_count
+    print(f"  Dates with extracted prices: {actual_count}")
 
     return {
         'start_date': start_date,
         'end_date': end_date,
         'expected_count': len(expected_dates),
-        'actual_count': len(actual_dates),
+        'actual_count': actual_count,
         'missing_count': len(missing_dates),
-        'missing_dates': sorted(missing_dates),
-        'unexpected_count': len(unexpected_dates),
-        'holidays': sorted([h for h in holidays if start_date <= h <= end_date]),
-        'coverage_pct': (len(expected_dates) - len(missing_dates)) / len(expected_dates) * 100 if expected_dates else 0
+        'missing_dates': missing_dates,
+        'unexpected_count': unexpected_count,
+        'holidays': holidays_between(start_date, end_date),
+        'coverage_pct': (len(expected_dates) - len(missing_dates)) / len(expected_dates) * 100 if len(expected_dates) else 0
     }
 
 
-def generate_report(results: dict) -> str:
-    """Generate markdown report from coverage analysis."""
-    lines = []
+# Name lookups indexed by date.month / date.weekday(); the calendar module's
+# sequences call strftime on every access, so materialize them once
+_MONTH_NAMES = tuple(calendar.month_name)
+_DAY_NAMES = tuple(calendar.day_name)
+_DAY_ABBRS = tuple(calendar.day_abbr)
 
-    lines.append("# SIPSA Data Coverage Report")
-    lines.append(f"\n**Analysis Period:** {results['start_date']} to {results['end_date']}")
-    lines.append(f"**Generated:** {date.today()}")
 
-    lines.append("\n## Summary\n")
-    lines.append("| Metric | Value |")
-    lines.append("|--------|------:|")
-    lines.append(f"| Expected Business Days | {results['expected_count']} |")
-    lines.append(f"| Days with Price Data | {results['actual_count']} |")
-    lines.append(f"| Missing Days | {results['missing_count']} |")
-    lines.append(f"| Coverage | {results['coverage_pct']:.1f}% |")
+def generate_report(results: dict):
+    """Generate markdown report lines from coverage analysis."""
+    yield "# SIPSA Data Coverage Report"
+    yield f"\n**Analysis Period:** {results['start_date']} to {results['end_date']}"
+    yield f"**Generated:** {date.today()}"
 
-    if results['missing_dates']:
-        lines.append("\n## Missing Days\n")
-        lines.append("These business days (Monday-Saturday, excluding Colombian holidays) have no extracted price data.\n")
+    yield "\n## Summary\n"
+    yield "| Metric | Value |"
+    yield "|--------|------:|"
+    yield f"| Expected Business Days | {results['expected_count']} |"
+    yield f"| Days with Price Data | {results['actual_count']} |"
+    yield f"| Missing Days | {results['missing_count']} |"
+    yield f"| Coverage | {results['coverage_pct']:.1f}% |"
 
-        # Group by year-month
-        by_month = defaultdict(list)
-        for d in results['missing_dates']:
-            by_month[(d.year, d.month)].append(d)
+    if results['missing_dates']:
+        yield "\n## Missing Days\n"
+        yield "These business days (Monday-Saturday, excluding Colombian holidays) have no extracted price data.\n"
 
-        for (year, month), dates in sorted(by_month.items()):
-            month_name = date(year, month, 1).strftime('%B %Y')
-            lines.append(f"\n### {month_name} ({len(dates)} days)\n")
+        # Group by year-month (missing_dates is already in calendar order)
+        for (year, month), month_dates in groupby(results['missing_dates'], key=lambda d: (d.year, d.month)):
+            dates = list(month_dates)
+            yield f"\n### {_MONTH_NAMES[month]} {year} ({len(dates)} days)\n"
 
             # Show dates in a compact format
-            date_strs = []
-            for d in dates:
-                day_name = d.strftime('%a')
-                date_strs.append(f"{d.day} ({day_name})")
+            date_strs = [f"{d.day} ({_DAY_ABBRS[d.weekday()]})" for d in dates]
 
-            # Wrap to ~80 chars per line
+            # Wrap to ~80 chars per line, tracking the running width instead of
+            # re-joining the line to measure it
             current_line = []
+            width = 0
             for ds in date_strs:
+                if current_line and width + 2 + len(ds) > 70:
+                    yield ', '.join(current_line)
+                    current_line = []
+                    width = 0
+                width += len(ds) + (2 if current_line else 0)
                 current_line.append(ds)
-                if len(', '.join(current_line)) > 70:
-                    lines.append(', '.join(current_line[:-1]))
-                    current_line = [ds]
             if current_line:
-                lines.append(', '.join(current_line))
+                yield ', '.join(current_line)
     else:
-        lines.append("\n## Missing Days\n")
-        lines.append("**No missing days found!** Full coverage achieved.")
+        yield "\n## Missing Days\n"
+        yield "**No missing days found!** Full coverage achieved."
 
     # Show holidays for reference
-    lines.append("\n## Colombian Holidays in Range\n")
-    lines.append("These dates were excluded from the expected coverage.\n")
+    yield "\n## Colombian Holidays in Range\n"
+    yield "These dates were excluded from the expected coverage.\n"
 
-    holiday_by_year = defaultdict(list)
-    for h in results['holidays']:
-        holiday_by_year[h.year].append(h)
-
-    for year, holidays in sorted(holiday_by_year.items()):
-        lines.append(f"\n### {year}\n")
+    for year, holidays in groupby(results['holidays'], key=lambda h: h.year):
+        yield f"\n### {year}\n"
         for h in holidays:
-            lines.append(f"- {h.strftime('%B %d')} ({h.strftime('%A')})")
-
-    lines.append("\n---")
-    lines.append("\n*Note: This report checks for Mon-Sat coverage. SIPSA data is published on business days.*")
+            yield f"- {_MONTH_NAMES[h.month]} {h.day:02d} ({_DAY_NAMES[h.weekday()]})"
 
-    return "\n".join(lines)
+    yield "\n---"
+    yield "\n*Note: This report checks for Mon-Sat coverage. SIPSA data is published on business days.*"
 
 
 def main():
@@ -342,11 +489,11 @@ def main():
 
     try:
         results = analyze_coverage(start, end)
-        report = generate_report(results)
 
         output_path = Path(__file__).parent.parent / args.output
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(report)
+        with output_path.open('w') as fh:
+            fh.writelines(f"{line}\n" for line in generate_report(results))
 
         print(f"\nCoverage: {results['coverage_pct']:.1f}%")
         print(f"Missing days: {results['missing_count']}")